@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the admin user browser
+Compares UserIndex pages against a linear scan over user_data
+
+Usage: python benchmarks/bench_user_index.py [user_count]
+"""
+
+import heapq
+import os
+import random
+import string
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from user_index import UserIndex, SORT_INTERACTIONS, SORT_JOINED, SEARCH_USERNAME
+
+PAGE_SIZE = 10
+
+
+def make_users(count: int, seed: int = 42) -> dict:
+    """Generate synthetic user records shaped like TelegramBot.user_data"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    users = {}
+    for chat_id in range(1, count + 1):
+        name = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+        users[chat_id] = {
+            'id': chat_id,
+            'username': name + str(chat_id),
+            'first_name': name.title(),
+            'joined_at': (start + timedelta(seconds=rng.randint(0, 3 * 10 ** 7))).isoformat(),
+            'interactions': rng.randint(0, 5000),
+        }
+    return users
+
+
+def linear_page(users: dict, sort: str, offset: int):
+    """The naive approach: one pass over every user on every page, keeping the top rows"""
+    if sort == SORT_INTERACTIONS:
+        top = heapq.nsmallest(offset + PAGE_SIZE, users.items(),
+                              key=lambda item: (-item[1]['interactions'], item[0]))
+    else:
+        top = heapq.nlargest(offset + PAGE_SIZE, users.items(),
+                             key=lambda item: (item[1]['joined_at'], item[0]))
+    return [chat_id for chat_id, _ in top[offset:]]
+
+
+def linear_search(users: dict, prefix: str):
+    """The naive approach: scan every username on every search"""
+    matches = sorted((d['username'].lower(), c) for c, d in users.items()
+                     if d['username'].lower().startswith(prefix))
+    return [c for _, c in matches[:PAGE_SIZE]]
+
+
+def timed(func, repeat: int) -> float:
+    """Return the mean time of func() in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} users...")
+    users = make_users(count)
+
+    index = UserIndex()
+    build_ms = timed(lambda: index.rebuild(users), 1)
+    print(f"Index build: {build_ms:,.0f} ms")
+
+    # Walk a few pages deep so cursors are exercised, not just the first page
+    def indexed_walk(sort):
+        cursor = None
+        for _ in range(5):
+            _, cursor = index.page(sort, cursor, PAGE_SIZE)
+
+    rng = random.Random(7)
+    prefixes = [''.join(rng.choices(string.ascii_lowercase, k=3)) for _ in range(50)]
+
+    print(f"\n{'Query':<28}{'Indexed (ms)':>14}{'Linear (ms)':>14}{'Speedup':>10}")
+    rows = [
+        ("5 pages by interactions", lambda: indexed_walk(SORT_INTERACTIONS),
+         lambda: [linear_page(users, SORT_INTERACTIONS, p * PAGE_SIZE) for p in range(5)], 200, 1),
+        ("5 pages by joined_at", lambda: indexed_walk(SORT_JOINED),
+         lambda: [linear_page(users, SORT_JOINED, p * PAGE_SIZE) for p in range(5)], 200, 1),
+        ("50 username prefix searches", lambda: [index.search(p, SEARCH_USERNAME) for p in prefixes],
+         lambda: [linear_search(users, p) for p in prefixes[:2]], 20, 1),
+    ]
+    for label, indexed, linear, indexed_repeat, linear_repeat in rows:
+        indexed_ms = timed(indexed, indexed_repeat)
+        linear_ms = timed(linear, linear_repeat)
+        if label.startswith("50 "):
+            # Linear search is only run for 2 prefixes; scale it to 50
+            linear_ms *= len(prefixes) / 2
+        print(f"{label:<28}{indexed_ms:>14.3f}{linear_ms:>14.1f}{linear_ms / indexed_ms:>9.0f}x")
+
+    # Live update cost: one interaction bump, as handle_message does
+    def bump():
+        chat_id = rng.randint(1, count)
+        users[chat_id]['interactions'] += 1
+        index.upsert(chat_id, users[chat_id])
+    print(f"\nInteraction update: {timed(bump, 10000) * 1000:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,10 @@ class BotConfig:
         'rate_limit_enabled': True,
         'max_requests_per_minute': 30,
         'ban_spam_users': True,
+        'spam_window_seconds': 60,  # how far back duplicate messages are counted
+        'spam_duplicate_threshold': 5,  # copies within the window that count as a flood
+        'spam_ban_score': 5.0,  # suspicion score that triggers a ban
+        'spam_ban_duration': 600,  # seconds
         'log_all_activity': True,
     }
     
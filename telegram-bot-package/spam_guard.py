@@ -0,0 +1,189 @@
+"""
+Spam detection for ProBot Telegram Bot
+Streaming duplicate / near-duplicate flood detection with temporary bans
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional
+
+# Verdicts returned by SpamGuard.check
+SPAM_OK = 'ok'
+SPAM_FLAGGED = 'flagged'
+SPAM_BANNED = 'banned'
+SPAM_MUTED = 'muted'
+
+# Bottom-k MinHash sketch: the SKETCH_SIZE smallest word hashes, split into
+# bands of BAND_ROWS; messages need a full sketch before bands are used, and
+# shorter ones need at least BAND_ROWS content words to key their word set
+SKETCH_SIZE = 6
+BAND_ROWS = 3
+
+# Common English words carry no signal and would make unrelated sentences
+# share their lowest hashes, so they are left out of the sketch
+STOPWORDS = frozenset('''
+    a about above after again against all am an and any are as at be because been
+    before being below between both but by can could did do does doing down during
+    each few for from further had has have having he her here hers him his how i if
+    in into is it its itself just me more most my no nor not now of off on once only
+    or other our ours out over own same she should so some such than that the their
+    theirs them then there these they this those through to too under until up very
+    was we were what when where which while who whom why will with would you your
+'''.split())
+
+# Suspicion added per flagged message
+EXACT_DUPLICATE_SCORE = 1.0
+NEAR_DUPLICATE_SCORE = 0.5
+
+
+class SpamGuard:
+    """
+    Detects duplicate and near-duplicate message floods across users
+
+    Every non-empty message gets an exact fingerprint and, when long enough,
+    near-duplicate keys for its content words. Keys seen at least
+    `duplicate_threshold` times inside the sliding window flag the message,
+    and each flag adds to the sender's suspicion score. Scores decay over
+    time; a score reaching `ban_score` bans the sender for `ban_duration`
+    seconds.
+
+    Memory is bounded: the window holds at most `max_entries` messages and
+    at most `max_tracked_users` scores and bans are kept.
+    """
+
+    def __init__(self, window_seconds: float = 60, duplicate_threshold: int = 5,
+                 ban_score: float = 5.0, ban_duration: float = 600,
+                 score_half_life: float = 60, min_length: int = 20,
+                 max_entries: int = 10000, max_tracked_users: int = 10000):
+        self.window_seconds = window_seconds
+        self.duplicate_threshold = duplicate_threshold
+        self.ban_score = ban_score
+        self.ban_duration = ban_duration
+        self.score_half_life = score_half_life
+        self.min_length = min_length
+        self.max_entries = max_entries
+        self.max_tracked_users = max_tracked_users
+
+        # (timestamp, fingerprint keys) in arrival order
+        self._window: deque = deque()
+        # fingerprint key -> occurrences inside the window
+        self._counts: Dict[int, int] = {}
+        # user_id -> [score, last update timestamp], least recent first
+        self._scores: OrderedDict = OrderedDict()
+        # user_id -> ban expiry timestamp
+        self._bans: Dict[int, float] = {}
+
+    @staticmethod
+    def fingerprint(text: str, near: bool = True) -> Optional[List[int]]:
+        """
+        Return the fingerprint keys for a message, or None if it is empty
+
+        The first key identifies the exact text, ignoring case and spacing,
+        so floods of links, emoji or one-liners are caught too. With `near`,
+        messages with 6 or more content words also get two band keys from a
+        bottom-6 MinHash sketch (the 6 smallest content-word hashes, split
+        into 2 bands of 3), so messages sharing most of their content words
+        usually share a band, while unrelated sentences almost never do.
+        Messages with 3 to 5 content words get one key for that word set.
+        """
+        words = text.lower().split()
+        if not words:
+            return None
+        keys = [hash(' '.join(words))]
+        if near:
+            # Only purely alphabetic words are sketched, so templated spam with
+            # varying numbers, links and punctuation ("Win $500 now!!") keeps these keys
+            sketch = sorted(map(hash, set(filter(str.isalpha, words)).difference(STOPWORDS)))
+            if len(sketch) >= SKETCH_SIZE:
+                for start in range(0, SKETCH_SIZE, BAND_ROWS):
+                    keys.append(hash((start, *sketch[start:start + BAND_ROWS])))
+            elif len(sketch) >= BAND_ROWS:
+                # Too few words for bands: identical content word sets still match
+                keys.append(hash(tuple(sketch)))
+        return keys
+
+    def is_banned(self, user_id: int, now: Optional[float] = None) -> bool:
+        """Check if a user is currently banned"""
+        until = self._bans.get(user_id)
+        if until is None:
+            return False
+        if (now if now is not None else time.monotonic()) >= until:
+            del self._bans[user_id]
+            return False
+        return True
+
+    def check(self, user_id: int, text: str, now: Optional[float] = None) -> str:
+        """
+        Inspect one message and return a verdict
+
+        SPAM_OK lets the message through, SPAM_FLAGGED drops it, SPAM_BANNED
+        drops it and marks the start of a ban, SPAM_MUTED drops it because
+        the sender is already banned.
+        """
+        if now is None:
+            now = time.monotonic()
+        if user_id in self._bans and self.is_banned(user_id, now):
+            return SPAM_MUTED
+
+        self._expire(now)
+        # Short messages share content words by chance, so they only get the exact key
+        keys = self.fingerprint(text, near=len(text) >= self.min_length)
+        if keys is None:
+            return SPAM_OK
+
+        counts = self._counts
+        get = counts.get
+        exact_key, *near_keys = keys
+        exact_count = counts[exact_key] = get(exact_key, 0) + 1
+        near_count = 0
+        for key in near_keys:
+            count = counts[key] = get(key, 0) + 1
+            if count > near_count:
+                near_count = count
+        self._window.append((now, keys))
+
+        threshold = self.duplicate_threshold
+        if exact_count >= threshold:
+            increment = EXACT_DUPLICATE_SCORE
+        elif near_count >= threshold:
+            increment = NEAR_DUPLICATE_SCORE
+        else:
+            return SPAM_OK
+
+        if self._add_score(user_id, increment, now) >= self.ban_score:
+            self._ban(user_id, now)
+            return SPAM_BANNED
+        return SPAM_FLAGGED
+
+    def _expire(self, now: float):
+        """Drop messages that left the time window or exceed the size cap"""
+        window = self._window
+        counts = self._counts
+        cutoff = now - self.window_seconds
+        while window and (window[0][0] < cutoff or len(window) >= self.max_entries):
+            for key in window.popleft()[1]:
+                remaining = counts[key] - 1
+                if remaining:
+                    counts[key] = remaining
+                else:
+                    del counts[key]
+
+    def _add_score(self, user_id: int, increment: float, now: float) -> float:
+        """Decay a user's suspicion score, add to it and return the new value"""
+        entry = self._scores.get(user_id)
+        if entry is None:
+            entry = self._scores[user_id] = [0.0, now]
+            if len(self._scores) > self.max_tracked_users:
+                self._scores.popitem(last=False)
+        else:
+            self._scores.move_to_end(user_id)
+        entry[0] = entry[0] * 0.5 ** ((now - entry[1]) / self.score_half_life) + increment
+        entry[1] = now
+        return entry[0]
+
+    def _ban(self, user_id: int, now: float):
+        self._scores.pop(user_id, None)
+        self._bans[user_id] = now + self.ban_duration
+        # Bans share one duration, so the oldest entry is the first to expire
+        while len(self._bans) > self.max_tracked_users:
+            del self._bans[next(iter(self._bans))]
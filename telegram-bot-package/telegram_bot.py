@@ -1,11 +1,16 @@
 import asyncio
+import html
 import logging
 import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
+from telegram.ext import Application, ApplicationHandlerStop, CommandHandler, MessageHandler, CallbackQueryHandler, TypeHandler, filters, ContextTypes
+
+from config import BotConfig
+from spam_guard import SpamGuard, SPAM_OK, SPAM_BANNED
+from user_index import UserIndex, SORT_INTERACTIONS, SORT_JOINED, SEARCH_USERNAME, SEARCH_FIRST_NAME
 
 # Configure logging
 logging.basicConfig(
@@ -14,6 +19,36 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Callback data modes for the admin user browser: au:<mode>:<query>:<cursor>
+USER_BROWSER_MODES = {
+    'i': SORT_INTERACTIONS,
+    'j': SORT_JOINED,
+    'u': SEARCH_USERNAME,
+    'f': SEARCH_FIRST_NAME,
+}
+# Messages the spam filter fingerprints; bans apply to every update
+SPAM_CHECKED_MESSAGES = filters.TEXT & ~filters.COMMAND
+
+# Telegram limits callback data to 64 bytes. Worst case, with a 20-character
+# chat_id (any signed 64-bit id): au:f:<16-byte query>:<chat_id>,<21-byte name key>
+MAX_SEARCH_QUERY_BYTES = 16
+
+def encode_user_cursor(mode: str, query: str, key: tuple) -> str:
+    """Build the callback data for the page after `key`, as <chat_id>,<sort key value>"""
+    value, chat_id = key
+    if mode == 'i':
+        value = -value
+    return f'au:{mode}:{query}:{chat_id},{value}'
+
+def decode_user_cursor(mode: str, cursor: str) -> Optional[tuple]:
+    """Turn the cursor part of callback data back into a UserIndex key"""
+    if not cursor:
+        return None
+    chat_id, value = cursor.split(',', 1)
+    if mode == 'i':
+        return (-int(value), int(chat_id))
+    return (value, int(chat_id))
+
 class TelegramBot:
     """
     Professional Telegram Bot with advanced features
@@ -24,6 +59,13 @@ class TelegramBot:
         self.token = token
         self.application = Application.builder().token(token).build()
         self.user_data: Dict[int, Dict] = {}
+        self.user_index = UserIndex()
+        self.spam_guard = SpamGuard(
+            window_seconds=BotConfig.SECURITY['spam_window_seconds'],
+            duplicate_threshold=BotConfig.SECURITY['spam_duplicate_threshold'],
+            ban_score=BotConfig.SECURITY['spam_ban_score'],
+            ban_duration=BotConfig.SECURITY['spam_ban_duration'],
+        )
         self.setup_handlers()
     
     def setup_handlers(self):
@@ -36,6 +78,11 @@ class TelegramBot:
         self.application.add_handler(CommandHandler("contact", self.contact_command))
         self.application.add_handler(CommandHandler("stats", self.stats_command))
         self.application.add_handler(CommandHandler("admin", self.admin_command))
+        self.application.add_handler(CommandHandler("users", self.users_command))
+        
+        # Spam filter sees every update in an earlier group, ahead of all other handlers
+        if BotConfig.SECURITY['ban_spam_users']:
+            self.application.add_handler(TypeHandler(Update, self.spam_filter), group=-1)
         
         # Message handlers
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
@@ -58,6 +105,7 @@ class TelegramBot:
             'joined_at': datetime.now().isoformat(),
             'interactions': 0
         }
+        self.user_index.upsert(chat_id, self.user_data[chat_id])
         
         welcome_message = f"""
 🤖 <b>Welcome to ProBot!</b>
@@ -98,6 +146,7 @@ Click the buttons below to explore my features!
 /contact - Contact information
 /stats - User statistics
 /admin - Admin panel (admin only)
+/users [name] - Browse or search users (admin only)
 
 <b>Features:</b>
 🎯 Smart AI Responses
@@ -108,7 +157,7 @@ Click the buttons below to explore my features!
 
 For support: @YourSupportHandle
         """
-        await update.message.reply_html(help_text)
+        await update.effective_message.reply_html(help_text)
     
     async def about_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /about command"""
@@ -180,7 +229,7 @@ This is a professional Telegram bot package designed for businesses and develope
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_html(features_text, reply_markup=reply_markup)
+        await update.effective_message.reply_html(features_text, reply_markup=reply_markup)
     
     async def contact_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /contact command"""
@@ -231,15 +280,12 @@ We're here to help! Don't hesitate to reach out.
         keyboard = [[InlineKeyboardButton("Refresh", callback_data='refresh_stats')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_html(stats_text, reply_markup=reply_markup)
+        await update.effective_message.reply_html(stats_text, reply_markup=reply_markup)
     
     async def admin_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /admin command (admin only)"""
-        # Simple admin check (you should implement proper admin validation)
-        admin_ids = [123456789]  # Replace with actual admin IDs
-        
-        if update.effective_user.id not in admin_ids:
-            await update.message.reply_html("❌ <b>Access Denied</b>\n\nYou don't have admin privileges.")
+        if not BotConfig.is_admin(update.effective_user.id):
+            await update.effective_message.reply_html("❌ <b>Access Denied</b>\n\nYou don't have admin privileges.")
             return
         
         admin_text = """
@@ -261,7 +307,82 @@ We're here to help! Don't hesitate to reach out.
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_html(admin_text, reply_markup=reply_markup)
+        await update.effective_message.reply_html(admin_text, reply_markup=reply_markup)
+    
+    async def users_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /users command - browse users, or search by name prefix (admin only)"""
+        if not BotConfig.is_admin(update.effective_user.id):
+            await update.effective_message.reply_html(BotConfig.get_message('admin_only'))
+            return
+        
+        query = ' '.join(context.args or [])
+        query = query.replace(':', '').encode()[:MAX_SEARCH_QUERY_BYTES].decode(errors='ignore')
+        mode = ('u' if query.startswith('@') else 'f') if query else 'i'
+        
+        text, reply_markup = self.render_user_page(mode, None, query)
+        await update.effective_message.reply_html(text, reply_markup=reply_markup)
+    
+    def render_user_page(self, mode: str, cursor: Optional[tuple], query: str = ''):
+        """Render one page of the admin user browser"""
+        field = USER_BROWSER_MODES[mode]
+        if mode in ('u', 'f'):
+            chat_ids, next_cursor = self.user_index.search(query, field, cursor)
+            heading = f"Search: <code>{html.escape(query)}</code> by {field.replace('_', ' ')}"
+        else:
+            chat_ids, next_cursor = self.user_index.page(field, cursor)
+            heading = "Sorted by: most active" if field == SORT_INTERACTIONS else "Sorted by: newest"
+        
+        lines = [f"👥 <b>User Management</b>\n<i>{heading}</i>\n"]
+        for chat_id in chat_ids:
+            data = self.user_data.get(chat_id, {})
+            name = html.escape(data.get('first_name') or 'Unknown')
+            username = f" (@{html.escape(data['username'])})" if data.get('username') else ''
+            joined = (data.get('joined_at') or '')[:10]
+            lines.append(f"• <b>{name}</b>{username} - {data.get('interactions', 0)} interactions, joined {joined}")
+        if not chat_ids:
+            lines.append("No users found.")
+        
+        if mode in ('u', 'f'):
+            keyboard = [[
+                InlineKeyboardButton("@ Username", callback_data=f'au:u:{query}:'),
+                InlineKeyboardButton("Aa First Name", callback_data=f'au:f:{query}:')
+            ]]
+        else:
+            keyboard = [[
+                InlineKeyboardButton("🔥 Most Active", callback_data='au:i::'),
+                InlineKeyboardButton("🆕 Newest", callback_data='au:j::')
+            ]]
+        navigation = []
+        if cursor is not None:
+            navigation.append(InlineKeyboardButton("⏮ First", callback_data=f'au:{mode}:{query}:'))
+        if next_cursor is not None:
+            navigation.append(InlineKeyboardButton("Next ▶", callback_data=encode_user_cursor(mode, query, next_cursor)))
+        if navigation:
+            keyboard.append(navigation)
+        
+        return '\n'.join(lines), InlineKeyboardMarkup(keyboard)
+    
+    async def spam_filter(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Drop flood messages, temporarily ban repeat senders and ignore banned users"""
+        user = update.effective_user
+        if user is None or BotConfig.is_admin(user.id):
+            return
+        
+        if self.spam_guard.is_banned(user.id):
+            if update.callback_query:
+                await update.callback_query.answer()
+            raise ApplicationHandlerStop
+        if not SPAM_CHECKED_MESSAGES.check_update(update):
+            return
+        
+        verdict = self.spam_guard.check(user.id, update.effective_message.text)
+        if verdict == SPAM_OK:
+            return
+        if verdict == SPAM_BANNED:
+            logger.warning("Temporarily banned user %s for spam", user.id)
+            minutes = int(BotConfig.SECURITY['spam_ban_duration'] // 60)
+            await update.effective_message.reply_html(f"🚫 <b>Slow down!</b>\n\nYou have been muted for {minutes} minutes for sending spam.")
+        raise ApplicationHandlerStop
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle text messages with smart responses"""
@@ -271,6 +392,7 @@ We're here to help! Don't hesitate to reach out.
         # Update user interaction count
         if chat_id in self.user_data:
             self.user_data[chat_id]['interactions'] = self.user_data[chat_id].get('interactions', 0) + 1
+            self.user_index.upsert(chat_id, self.user_data[chat_id])
         
         # Smart response system
         response = self.generate_smart_response(message_text)
@@ -298,7 +420,7 @@ We're here to help! Don't hesitate to reach out.
             return f"""
 🤖 <b>Smart Response</b>
 
-You said: "<i>{message}</i>"
+You said: "<i>{html.escape(message)}</i>"
 
 That's interesting! I'm an AI-powered bot that can help with various tasks. Try asking me about:
 
@@ -327,21 +449,32 @@ Type /help to see all available commands!
         chat_id = query.message.chat_id
         
         if data == 'features':
-            await self.features_command(query, context)
+            await self.features_command(update, context)
         elif data == 'stats':
-            await self.stats_command(query, context)
+            await self.stats_command(update, context)
         elif data == 'help':
-            await self.help_command(query, context)
+            await self.help_command(update, context)
         elif data == 'admin':
-            await self.admin_command(query, context)
+            await self.admin_command(update, context)
         elif data == 'refresh_stats':
-            await self.stats_command(query, context)
+            await self.stats_command(update, context)
         elif data == 'try_ai':
             await query.message.reply_html("🤖 <b>AI Chat Mode Active!</b>\n\nSend me a message and I'll respond with AI-powered intelligence!")
         elif data == 'try_file':
             await query.message.reply_html("📁 <b>File Processing Ready!</b>\n\nSend me a photo or document to test my file processing capabilities!")
         elif data == 'admin_close':
             await query.message.delete()
+        elif data == 'admin_users' or data.startswith('au:'):
+            if not BotConfig.is_admin(query.from_user.id):
+                await query.message.reply_html(BotConfig.get_message('admin_only'))
+                return
+            if data == 'admin_users':
+                text, reply_markup = self.render_user_page('i', None)
+                await query.message.reply_html(text, reply_markup=reply_markup)
+            else:
+                _, mode, search, cursor = data.split(':', 3)
+                text, reply_markup = self.render_user_page(mode, decode_user_cursor(mode, cursor), search)
+                await query.edit_message_text(text, parse_mode='HTML', reply_markup=reply_markup)
         else:
             await query.message.reply_html(f"✅ You selected: {data}")
     
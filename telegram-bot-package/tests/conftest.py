@@ -0,0 +1,154 @@
+"""
+Shared fixtures for ProBot tests and benchmarks
+"""
+
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness import RecordingBot
+from telegram_bot import TelegramBot
+
+BASELINE_FILE = Path(__file__).parent / 'benchmark_baseline.json'
+# Minimum time spent measuring each benchmark, in seconds
+MIN_MEASURE_TIME = 0.05
+REPEATS = 5
+
+
+def pytest_addoption(parser):
+    # Prefixed --bench-* so the options never clash with pytest-benchmark's --benchmark-*
+    group = parser.getgroup('bench', 'ProBot benchmark baselines')
+    group.addoption('--bench-baseline-save', action='store_true',
+                    help='Write measured timings to tests/benchmark_baseline.json')
+    group.addoption('--bench-threshold', type=float, default=2.0,
+                    help='Fail a benchmark slower than this multiple of its baseline (default: 2.0)')
+    group.addoption('--bench-skip', action='store_true', help='Skip benchmark tests')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--bench-skip'):
+        skip = pytest.mark.skip(reason='--bench-skip given')
+        for item in items:
+            if 'bench' in item.fixturenames:
+                item.add_marker(skip)
+
+
+def _calibrate() -> float:
+    """Time a fixed pure-Python workload, used to scale baselines across machines"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        total = 0
+        for i in range(200000):
+            total += i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class BenchmarkSession:
+    """Holds the stored baseline and the timings measured in this run"""
+
+    def __init__(self, config):
+        self.save = config.getoption('--bench-baseline-save')
+        self.threshold = config.getoption('--bench-threshold')
+        self.baseline = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+        self.calibration = _calibrate()
+        self.results = {}
+
+    @property
+    def scale(self) -> float:
+        """How much slower this machine is than the one that recorded the baseline"""
+        return self.calibration / self.baseline.get('_calibration', self.calibration)
+
+    def write(self):
+        # Entries not measured in this run were timed against the stored
+        # calibration; convert them to this machine's before replacing it
+        scale = self.scale
+        results = {name: round(micros * scale, 3) for name, micros in self.baseline.items()
+                   if not name.startswith('_')}
+        results.update(self.results)
+        results['_calibration'] = self.calibration
+        BASELINE_FILE.write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+
+
+@pytest.fixture(scope='session')
+def benchmark_session(request):
+    session = BenchmarkSession(request.config)
+    yield session
+    if session.save and session.results:
+        session.write()
+
+
+@pytest.fixture
+def bench(request, benchmark_session):
+    """
+    Time a callable (sync or async) and compare it to the stored baseline
+
+    Usage mirrors pytest-benchmark: bench(func, *args) runs func many
+    times, records the best mean time per call and returns its last result.
+    """
+    name = request.node.nodeid.split('::', 1)[1]
+
+    def run(func, *args):
+        if asyncio.iscoroutinefunction(func):
+            loop = asyncio.new_event_loop()
+            call = lambda: loop.run_until_complete(func(*args))
+        else:
+            loop = None
+            call = lambda: func(*args)
+
+        # Like timeit, keep the garbage collector out of the measurement
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            # Find a round count that keeps each repeat above MIN_MEASURE_TIME
+            rounds = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    result = call()
+                if time.perf_counter() - start >= MIN_MEASURE_TIME or rounds >= 100000:
+                    break
+                rounds *= 10
+
+            best = float('inf')
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    result = call()
+                best = min(best, (time.perf_counter() - start) / rounds)
+        finally:
+            if gc_enabled:
+                gc.enable()
+            if loop is not None:
+                loop.close()
+
+        micros = best * 1e6
+        benchmark_session.results[name] = round(micros, 3)
+        baseline = benchmark_session.baseline.get(name)
+        if baseline is not None and not benchmark_session.save:
+            allowed = baseline * benchmark_session.scale * benchmark_session.threshold
+            if micros > allowed:
+                pytest.fail(f"{name} regressed: {micros:.1f} us per call, "
+                            f"baseline {baseline:.1f} us (limit {allowed:.1f} us)")
+        return result
+
+    return run
+
+
+@pytest.fixture
+def fake_bot():
+    return RecordingBot()
+
+
+@pytest.fixture
+def bot():
+    return TelegramBot('123456:TEST-TOKEN')
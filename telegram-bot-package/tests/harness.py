@@ -0,0 +1,145 @@
+"""
+In-process test harness for ProBot Telegram Bot
+Update/CallbackQuery factories and a recording fake bot, no network needed
+"""
+
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from telegram import CallbackQuery, Chat, Document, Message, MessageEntity, PhotoSize, Update, User
+
+ADMIN_ID = 123456789
+USER_ID = 1001
+BOT_ID = 123456
+BOT_USERNAME = 'probot_test'
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+_ids = count(1)
+
+
+class RecordingBot:
+    """
+    Stand-in for telegram.Bot that records every API call
+
+    Message and CallbackQuery shortcuts (reply_html, edit_message_text,
+    answer, delete) end up here instead of going to Telegram.
+    """
+
+    def __init__(self):
+        # CommandHandler matches "/cmd@username" against the bot's username
+        self.id = BOT_ID
+        self.username = BOT_USERNAME
+        self.calls: List[Dict] = []
+
+    def _record(self, method: str, **kwargs) -> Dict:
+        call = {'method': method, **kwargs}
+        self.calls.append(call)
+        return call
+
+    def clear(self):
+        self.calls.clear()
+
+    @property
+    def sent(self) -> List[Dict]:
+        """Calls that produced visible output (sent or edited messages)"""
+        return [c for c in self.calls if c['method'] in ('send_message', 'edit_message_text')]
+
+    @property
+    def last_text(self) -> Optional[str]:
+        return self.sent[-1]['text'] if self.sent else None
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self._record('send_message', chat_id=chat_id, text=text, **kwargs)
+        return make_message(text, chat_id=chat_id, bot=self)
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, **kwargs):
+        self._record('edit_message_text', chat_id=chat_id, message_id=message_id, text=text, **kwargs)
+        return True
+
+    async def delete_message(self, chat_id, message_id, **kwargs):
+        self._record('delete_message', chat_id=chat_id, message_id=message_id)
+        return True
+
+    async def answer_callback_query(self, callback_query_id, **kwargs):
+        self._record('answer_callback_query', callback_query_id=callback_query_id, **kwargs)
+        return True
+
+
+def make_user(user_id: int = USER_ID, first_name: str = 'Test', username: Optional[str] = 'tester') -> User:
+    return User(id=user_id, first_name=first_name, is_bot=False, username=username)
+
+
+def make_message(text: Optional[str] = None, user: Optional[User] = None, chat_id: Optional[int] = None,
+                 bot: Optional[RecordingBot] = None, **kwargs) -> Message:
+    """Build a private-chat Message bound to the fake bot"""
+    user = user or make_user()
+    chat = Chat(id=chat_id if chat_id is not None else user.id, type=Chat.PRIVATE)
+    if text and text.startswith('/'):
+        # Telegram marks commands with an entity; CommandHandler and filters.COMMAND rely on it
+        kwargs.setdefault('entities', [MessageEntity(MessageEntity.BOT_COMMAND, 0, len(text.split()[0]))])
+    message = Message(message_id=next(_ids), date=datetime.now(), chat=chat, from_user=user,
+                      text=text, **kwargs)
+    message.set_bot(bot)
+    return message
+
+
+def make_update(text: Optional[str] = None, user: Optional[User] = None,
+                bot: Optional[RecordingBot] = None, **kwargs) -> Update:
+    """Build an Update carrying a message, as a command or text handler receives it"""
+    return Update(update_id=next(_ids), message=make_message(text, user=user, bot=bot, **kwargs))
+
+
+def make_photo_update(user: Optional[User] = None, bot: Optional[RecordingBot] = None) -> Update:
+    photo = [PhotoSize(file_id='photo', file_unique_id='photo', width=640, height=480)]
+    return make_update(user=user, bot=bot, photo=photo)
+
+
+def make_document_update(user: Optional[User] = None, bot: Optional[RecordingBot] = None) -> Update:
+    document = Document(file_id='doc', file_unique_id='doc', file_name='report.pdf')
+    return make_update(user=user, bot=bot, document=document)
+
+
+def make_callback_update(data: str, user: Optional[User] = None,
+                         bot: Optional[RecordingBot] = None) -> Update:
+    """Build an Update carrying a CallbackQuery from an inline keyboard button"""
+    user = user or make_user()
+    message = make_message('keyboard', chat_id=user.id, bot=bot)
+    query = CallbackQuery(id=str(next(_ids)), from_user=user, chat_instance='chat', data=data,
+                          message=message)
+    query.set_bot(bot)
+    return Update(update_id=next(_ids), callback_query=query)
+
+
+def make_context(args: Optional[List[str]] = None, bot: Optional[RecordingBot] = None):
+    """Minimal stand-in for ContextTypes.DEFAULT_TYPE"""
+    return SimpleNamespace(args=args or [], bot=bot)
+
+
+def make_user_data(size: int) -> Dict[int, Dict]:
+    """Generate user records shaped like TelegramBot.user_data"""
+    today = datetime.now()
+    return {
+        chat_id: {
+            'id': chat_id,
+            'username': f'user{chat_id}',
+            'first_name': f'Name{chat_id % 997}',
+            'joined_at': today.replace(day=1 + chat_id % 28).isoformat(),
+            'interactions': chat_id % 113,
+        }
+        for chat_id in range(1, size + 1)
+    }
+
+
+def english_sentences() -> List[str]:
+    """
+    Distinct English sentences from tests/data/english_sentences.txt
+
+    A fixed, realistic corpus for false-positive checks: ordinary prose
+    with stopwords and shared phrasing, unlike random word salad. The
+    lines were taken once from comments in the Python standard library.
+    """
+    return (DATA_DIR / 'english_sentences.txt').read_text(encoding='utf-8').splitlines()
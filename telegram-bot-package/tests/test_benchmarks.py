@@ -0,0 +1,90 @@
+"""
+Benchmarks for ProBot hot paths
+
+Each benchmark is compared to tests/benchmark_baseline.json and fails when
+it is slower than --bench-threshold times the baseline. Refresh the
+baseline with: python -m pytest tests/test_benchmarks.py --bench-baseline-save
+"""
+
+import random
+import string
+from itertools import cycle
+
+import pytest
+
+from harness import (ADMIN_ID, make_callback_update, make_context, make_document_update,
+                     make_photo_update, make_update, make_user, make_user_data)
+from spam_guard import SpamGuard
+from telegram_bot import export_user_data, generate_bot_stats
+
+DATA_SIZES = [100, 10000, 100000]
+
+
+@pytest.fixture
+def populated_bot(bot):
+    bot.user_data.update(make_user_data(10000))
+    bot.user_index.rebuild(bot.user_data)
+    return bot
+
+
+@pytest.mark.parametrize('handler', [
+    'start_command', 'help_command', 'about_command', 'features_command',
+    'contact_command', 'stats_command', 'admin_command',
+])
+def test_bench_commands(bench, populated_bot, fake_bot, handler):
+    update = make_update('/cmd', user=make_user(ADMIN_ID), bot=fake_bot)
+    bench(getattr(populated_bot, handler), update, make_context())
+
+
+def test_bench_users_command(bench, populated_bot, fake_bot):
+    update = make_update('/users name1', user=make_user(ADMIN_ID), bot=fake_bot)
+    bench(populated_bot.users_command, update, make_context(['name1']))
+
+
+def test_bench_handle_message(bench, populated_bot, fake_bot):
+    update = make_update('Tell me something interesting about this bot', user=make_user(42), bot=fake_bot)
+    bench(populated_bot.handle_message, update, make_context())
+
+
+def test_bench_spam_filter(bench, populated_bot, fake_bot):
+    # Unrelated texts from distinct users, so nothing is flagged as a flood
+    rng = random.Random(0)
+    vocabulary = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2000)]
+    updates = cycle([make_update(' '.join(rng.choices(vocabulary, k=12)), user=make_user(n), bot=fake_bot)
+                     for n in range(1000)])
+    context = make_context()
+    # A window shorter than the cycle keeps repeats of the same text apart
+    populated_bot.spam_guard = SpamGuard(max_entries=500)
+
+    async def filter_next():
+        await populated_bot.spam_filter(next(updates), context)
+
+    bench(filter_next)
+
+
+def test_bench_handle_photo(bench, bot, fake_bot):
+    bench(bot.handle_photo, make_photo_update(bot=fake_bot), make_context())
+
+
+def test_bench_handle_document(bench, bot, fake_bot):
+    bench(bot.handle_document, make_document_update(bot=fake_bot), make_context())
+
+
+@pytest.mark.parametrize('data', ['features', 'stats', 'try_ai', 'admin_users', 'au:i::5000,50', 'au:u:@user12:'])
+def test_bench_handle_callback(bench, populated_bot, fake_bot, data):
+    update = make_callback_update(data, user=make_user(ADMIN_ID), bot=fake_bot)
+    bench(populated_bot.handle_callback, update, make_context())
+
+
+@pytest.mark.parametrize('size', DATA_SIZES)
+def test_bench_export_user_data(bench, size):
+    user_data = make_user_data(size)
+    csv = bench(export_user_data, user_data)
+    assert csv.count('\n') == size + 1
+
+
+@pytest.mark.parametrize('size', DATA_SIZES)
+def test_bench_generate_bot_stats(bench, size):
+    user_data = make_user_data(size)
+    stats = bench(generate_bot_stats, user_data)
+    assert stats['total_users'] == size
@@ -0,0 +1,240 @@
+"""
+Handler tests for ProBot Telegram Bot
+"""
+
+import pytest
+from telegram import User
+from telegram.ext import ApplicationHandlerStop, ExtBot
+
+from config import BotConfig
+from harness import (ADMIN_ID, BOT_ID, BOT_USERNAME, USER_ID, english_sentences, make_callback_update,
+                     make_context, make_document_update, make_photo_update, make_update, make_user)
+from spam_guard import SPAM_OK
+from telegram_bot import USER_BROWSER_MODES, TelegramBot
+
+
+async def start(bot, fake_bot, user=None):
+    await bot.start_command(make_update('/start', user=user, bot=fake_bot), make_context())
+
+
+@pytest.mark.asyncio
+async def test_start_registers_user(bot, fake_bot):
+    await start(bot, fake_bot)
+
+    assert bot.user_data[1001]['username'] == 'tester'
+    assert 'Welcome to ProBot' in fake_bot.last_text
+    assert bot.user_index.page()[0] == [1001]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('handler, expected', [
+    ('help_command', 'Help Center'),
+    ('about_command', 'About ProBot'),
+    ('features_command', 'ProBot Features'),
+    ('contact_command', 'Contact Information'),
+    ('stats_command', 'Bot Statistics'),
+])
+async def test_info_commands(bot, fake_bot, handler, expected):
+    await getattr(bot, handler)(make_update('/cmd', bot=fake_bot), make_context())
+
+    assert expected in fake_bot.last_text
+    assert fake_bot.sent[-1]['parse_mode'] == 'HTML'
+
+
+@pytest.mark.asyncio
+async def test_admin_command_requires_admin(bot, fake_bot):
+    await bot.admin_command(make_update('/admin', bot=fake_bot), make_context())
+    assert 'Access Denied' in fake_bot.last_text
+
+    await bot.admin_command(make_update('/admin', user=make_user(ADMIN_ID), bot=fake_bot), make_context())
+    assert 'Admin Panel' in fake_bot.last_text
+
+
+@pytest.mark.asyncio
+async def test_users_command_searches_by_prefix(bot, fake_bot):
+    await start(bot, fake_bot, make_user(1, 'Alice', 'alice'))
+    await start(bot, fake_bot, make_user(2, 'Bob', 'albert'))
+
+    admin = make_user(ADMIN_ID)
+    await bot.users_command(make_update('/users @al', user=admin, bot=fake_bot), make_context(['@al']))
+    assert '@alice' in fake_bot.last_text and '@albert' in fake_bot.last_text
+
+    await bot.users_command(make_update('/users bo', user=admin, bot=fake_bot), make_context(['bo']))
+    assert '@albert' in fake_bot.last_text and '@alice' not in fake_bot.last_text
+
+
+@pytest.mark.asyncio
+async def test_handle_message_counts_and_escapes(bot, fake_bot):
+    await start(bot, fake_bot)
+    await bot.handle_message(make_update('<script>x</script>', bot=fake_bot), make_context())
+
+    assert bot.user_data[1001]['interactions'] == 1
+    assert '&lt;script&gt;' in fake_bot.last_text
+
+
+@pytest.mark.asyncio
+async def test_spam_filter_bans_flooders(bot, fake_bot):
+    text = 'Earn money fast from home, join our channel today'
+    for _ in range(4):
+        await bot.spam_filter(make_update(text, bot=fake_bot), make_context())
+    # Scores decay, so the ban lands on the sixth flagged message
+    for _ in range(6):
+        with pytest.raises(ApplicationHandlerStop):
+            await bot.spam_filter(make_update(text, bot=fake_bot), make_context())
+    assert bot.spam_guard.is_banned(1001)
+    assert 'muted' in fake_bot.last_text
+
+    # A muted user is ignored whatever they send, and others are unaffected
+    for update in (make_update('/start', bot=fake_bot), make_photo_update(bot=fake_bot),
+                   make_document_update(bot=fake_bot), make_callback_update('stats', bot=fake_bot)):
+        with pytest.raises(ApplicationHandlerStop):
+            await bot.spam_filter(update, make_context())
+    assert fake_bot.calls[-1]['method'] == 'answer_callback_query'
+    await bot.spam_filter(make_update('/start', user=make_user(7), bot=fake_bot), make_context())
+    await bot.spam_filter(make_callback_update('stats', user=make_user(7), bot=fake_bot), make_context())
+
+
+@pytest.mark.parametrize('text, users', [
+    ('🔥🔥🔥 t.me/xyz 🔥🔥🔥 $$$ 500$ 100% !!!', 1),
+    ('buy cheap pills now', 100),
+])
+def test_spam_guard_catches_floods_without_content_words(bot, text, users):
+    # Link-only and short messages have no sketch, so only the exact key can catch them
+    guard = bot.spam_guard
+    verdicts = [guard.check(n % users, text, now=n / 10) for n in range(100)]
+    assert verdicts[:4] == [SPAM_OK] * 4
+    assert SPAM_OK not in verdicts[4:]
+
+
+@pytest.mark.asyncio
+async def test_spam_filter_stops_dispatch_for_muted_users(bot, fake_bot, monkeypatch):
+    async def get_me(self, *args, **kwargs):
+        return User(id=BOT_ID, first_name='ProBot', is_bot=True, username=BOT_USERNAME)
+
+    # Initialize the application offline, then feed updates through its real handler groups
+    monkeypatch.setattr(ExtBot, 'get_me', get_me)
+    application = bot.application
+    await application.initialize()
+    try:
+        await application.process_update(make_update('/start', bot=fake_bot))
+        for _ in range(10):
+            await application.process_update(make_update('Earn money fast from home, join our channel today',
+                                                         bot=fake_bot))
+        assert 'muted' in fake_bot.last_text
+        assert bot.user_data[USER_ID]['interactions'] == 4
+
+        fake_bot.clear()
+        for update in (make_update('hello again', bot=fake_bot), make_update('/start', bot=fake_bot),
+                       make_callback_update('stats', bot=fake_bot)):
+            await application.process_update(update)
+        assert [call['method'] for call in fake_bot.calls] == ['answer_callback_query']
+        assert bot.user_data[USER_ID]['interactions'] == 4
+
+        await application.process_update(make_update('/help', user=make_user(7), bot=fake_bot))
+        assert 'Help Center' in fake_bot.last_text
+    finally:
+        await application.shutdown()
+
+
+def test_spam_filter_follows_config(monkeypatch):
+    assert TelegramBot('123456:TEST-TOKEN').application.handlers[-1][0].callback.__name__ == 'spam_filter'
+
+    monkeypatch.setitem(BotConfig.SECURITY, 'ban_spam_users', False)
+    assert -1 not in TelegramBot('123456:TEST-TOKEN').application.handlers
+
+
+def test_spam_filter_passes_real_sentences(bot):
+    # Distinct real sentences from different users, at a busy 100 messages per second
+    guard = bot.spam_guard
+    for n, sentence in enumerate(english_sentences()):
+        assert guard.check(n, sentence, now=n / 100) == SPAM_OK, sentence
+
+
+@pytest.mark.asyncio
+async def test_media_handlers(bot, fake_bot):
+    await bot.handle_photo(make_photo_update(bot=fake_bot), make_context())
+    assert 'Photo received' in fake_bot.last_text
+
+    await bot.handle_document(make_document_update(bot=fake_bot), make_context())
+    assert 'Document received' in fake_bot.last_text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('data, expected', [
+    ('features', 'ProBot Features'),
+    ('stats', 'Bot Statistics'),
+    ('help', 'Help Center'),
+    ('refresh_stats', 'Bot Statistics'),
+    ('try_ai', 'AI Chat Mode'),
+    ('try_file', 'File Processing Ready'),
+    ('admin_users', 'administrators only'),
+    ('something_else', 'You selected: something_else'),
+])
+async def test_callbacks(bot, fake_bot, data, expected):
+    await bot.handle_callback(make_callback_update(data, bot=fake_bot), make_context())
+
+    assert fake_bot.calls[0]['method'] == 'answer_callback_query'
+    assert expected.lower() in fake_bot.last_text.lower()
+
+
+@pytest.mark.asyncio
+async def test_user_browser_pages_through_callbacks(bot, fake_bot):
+    for chat_id in range(1, 16):
+        await start(bot, fake_bot, make_user(chat_id, f'User{chat_id}', f'user{chat_id}'))
+    admin = make_user(ADMIN_ID)
+
+    await bot.handle_callback(make_callback_update('admin_users', user=admin, bot=fake_bot), make_context())
+    next_button = bot.render_user_page('i', None)[1].inline_keyboard[-1][-1]
+    assert next_button.text == 'Next ▶'
+
+    await bot.handle_callback(make_callback_update(next_button.callback_data, user=admin, bot=fake_bot),
+                              make_context())
+    assert fake_bot.sent[-1]['method'] == 'edit_message_text'
+    assert fake_bot.last_text.count('•') == 5
+
+
+@pytest.mark.asyncio
+async def test_admin_close_deletes_panel(bot, fake_bot):
+    await bot.handle_callback(make_callback_update('admin_close', bot=fake_bot), make_context())
+    assert fake_bot.calls[-1]['method'] == 'delete_message'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', ['i', 'j'])
+async def test_user_browser_cursor_survives_record_changes(bot, fake_bot, mode):
+    for chat_id in range(1, 16):
+        await start(bot, fake_bot, make_user(chat_id, f'User{chat_id}', f'user{chat_id}'))
+        bot.user_data[chat_id].update(interactions=chat_id, joined_at=f'2026-01-{chat_id:02d}T00:00:00')
+        bot.user_index.upsert(chat_id, bot.user_data[chat_id])
+    first_page, _ = bot.user_index.page(USER_BROWSER_MODES[mode])
+    next_data = bot.render_user_page(mode, None)[1].inline_keyboard[-1][-1].callback_data
+
+    # The last user on page 1 re-runs /start, resetting their interactions and join date
+    await start(bot, fake_bot, make_user(first_page[-1], 'Moved', 'moved'))
+    bot.user_data[first_page[-1]]['joined_at'] = '2026-12-31T00:00:00'
+    bot.user_index.upsert(first_page[-1], bot.user_data[first_page[-1]])
+
+    admin = make_user(ADMIN_ID)
+    await bot.handle_callback(make_callback_update(next_data, user=admin, bot=fake_bot), make_context())
+    for chat_id in set(range(1, 16)) - set(first_page):
+        assert f'@user{chat_id})' in fake_bot.last_text
+    for chat_id in first_page[:-1]:
+        assert f'@user{chat_id})' not in fake_bot.last_text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('query', ['a' * 40, '@' + 'a' * 40, 'é' * 20])
+async def test_user_browser_callback_data_fits_telegram_limit(bot, fake_bot, query):
+    # The longest chat_ids (signed 64-bit) and names that fill the whole index key
+    name = query.lstrip('@') * 2
+    for n in range(12):
+        chat_id = -2 ** 63 + n
+        bot.user_data[chat_id] = {'id': chat_id, 'username': name, 'first_name': name,
+                                  'joined_at': '2026-01-01T00:00:00', 'interactions': 0}
+        bot.user_index.upsert(chat_id, bot.user_data[chat_id])
+
+    await bot.users_command(make_update('/users', user=make_user(ADMIN_ID), bot=fake_bot), make_context([query]))
+    buttons = [button for row in fake_bot.sent[-1]['reply_markup'].inline_keyboard for button in row]
+    assert buttons[-1].text == 'Next ▶'
+    for button in buttons:
+        assert len(button.callback_data.encode()) <= 64, button.callback_data
@@ -0,0 +1,131 @@
+"""
+User index for ProBot Telegram Bot
+Sorted indexes over user data for fast admin search and pagination
+"""
+
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from sortedcontainers import SortedList
+
+# Highest code point, used as the upper bound of a prefix range
+_PREFIX_END = '\U0010ffff'
+
+SORT_INTERACTIONS = 'interactions'
+SORT_JOINED = 'joined'
+SEARCH_USERNAME = 'username'
+SEARCH_FIRST_NAME = 'first_name'
+
+# Names are indexed by their first bytes only, so any key fits in a cursor
+# inside Telegram's 64-byte callback data; prefix search works up to this length
+NAME_KEY_BYTES = 21
+
+
+class UserIndex:
+    """
+    Maintained indexes over the bot's user records
+
+    Every index is a SortedList of (key, chat_id) tuples, so a page costs
+    O(log n + page_size) instead of a scan over all users. Pages are
+    addressed by a cursor: the (key, chat_id) entry of the last row on the
+    previous page. The cursor carries the key value itself, so paging stays
+    in place even if that user's record changes between pages.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, SortedList] = {
+            SEARCH_USERNAME: SortedList(),
+            SEARCH_FIRST_NAME: SortedList(),
+            SORT_INTERACTIONS: SortedList(),
+            SORT_JOINED: SortedList(),
+        }
+        # chat_id -> keys currently stored in each index
+        self._keys: Dict[int, Dict[str, tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _make_keys(chat_id: int, record: Dict) -> Dict[str, tuple]:
+        """Build the index keys for a user record"""
+        keys = {
+            # Most active first, ties broken by chat_id
+            SORT_INTERACTIONS: (-record.get('interactions', 0), chat_id),
+            # ISO timestamps sort chronologically; paged newest first
+            SORT_JOINED: (record.get('joined_at') or '', chat_id),
+        }
+        if record.get('username'):
+            keys[SEARCH_USERNAME] = (_name_key(record['username']), chat_id)
+        if record.get('first_name'):
+            keys[SEARCH_FIRST_NAME] = (_name_key(record['first_name']), chat_id)
+        return keys
+
+    def upsert(self, chat_id: int, record: Dict):
+        """Add a user or refresh the indexes after their record changed"""
+        new_keys = self._make_keys(chat_id, record)
+        old_keys = self._keys.get(chat_id, {})
+        for name, index in self._indexes.items():
+            old = old_keys.get(name)
+            new = new_keys.get(name)
+            if old == new:
+                continue
+            if old is not None:
+                index.remove(old)
+            if new is not None:
+                index.add(new)
+        self._keys[chat_id] = new_keys
+
+    def remove(self, chat_id: int):
+        """Drop a user from every index"""
+        old_keys = self._keys.pop(chat_id, {})
+        for name, index in self._indexes.items():
+            if name in old_keys:
+                index.remove(old_keys[name])
+
+    def rebuild(self, user_data: Dict[int, Dict]):
+        """Rebuild all indexes from scratch"""
+        self._keys = {chat_id: self._make_keys(chat_id, record) for chat_id, record in user_data.items()}
+        for name, index in self._indexes.items():
+            # Bulk-loading sorts once, far cheaper than one add() per user
+            index.clear()
+            index.update(keys[name] for keys in self._keys.values() if name in keys)
+
+    def page(self, sort: str = SORT_INTERACTIONS, cursor: Optional[tuple] = None,
+             limit: int = 10) -> Tuple[List[int], Optional[tuple]]:
+        """
+        Return one page of chat_ids ordered by `sort`
+
+        Returns (chat_ids, next_cursor); next_cursor is None on the last page.
+        """
+        index = self._indexes[sort]
+        if sort == SORT_JOINED:
+            rows = index.irange(maximum=cursor, inclusive=(True, False), reverse=True)
+        else:
+            rows = index.irange(minimum=cursor, inclusive=(False, True))
+        return self._take(rows, limit)
+
+    def search(self, query: str, field: str = SEARCH_USERNAME, cursor: Optional[tuple] = None,
+               limit: int = 10) -> Tuple[List[int], Optional[tuple]]:
+        """
+        Return one page of chat_ids whose `field` starts with `query`
+
+        Matching is case-insensitive; a leading '@' is ignored.
+        """
+        prefix = _name_key(query.lstrip('@'))
+        index = self._indexes[field]
+        minimum = (prefix,) if cursor is None else max(cursor, (prefix,))
+        rows = index.irange(minimum=minimum, maximum=(prefix + _PREFIX_END,),
+                            inclusive=(False, False))
+        return self._take(rows, limit)
+
+    @staticmethod
+    def _take(rows, limit: int) -> Tuple[List[int], Optional[tuple]]:
+        chunk = list(islice(rows, limit + 1))
+        chat_ids = [chat_id for _, chat_id in chunk[:limit]]
+        if len(chunk) > limit:
+            return chat_ids, chunk[limit - 1]
+        return chat_ids, None
+
+
+def _name_key(name: str) -> str:
+    return name.lower().encode()[:NAME_KEY_BYTES].decode(errors='ignore')